@@ -3,11 +3,17 @@ AutoResearch Lab - Agents Package
 All specialized research agents
 """
 
-from .problem_finder import ProblemFinderAgent
-from .hypothesis_generator import HypothesisAgent
-from .experiment_designer import ExperimentDesignerAgent
-from .data_analyst import DataAnalysisAgent
-from .paper_writer import PaperWriterAgent
+import importlib
+
+# Agents are imported on first access (PEP 562) so that using one agent
+# does not pull in the heavy dependencies of the others
+_AGENT_MODULES = {
+    'ProblemFinderAgent': 'problem_finder',
+    'HypothesisAgent': 'hypothesis_generator',
+    'ExperimentDesignerAgent': 'experiment_designer',
+    'DataAnalysisAgent': 'data_analyst',
+    'PaperWriterAgent': 'paper_writer'
+}
 
 __all__ = [
     
@@ -18,4 +24,15 @@ __all__ = [
     'PaperWriterAgent'
 ]
 
-__version__ = '1.0.0'
\ No newline at end of file
+__version__ = '1.0.0'
+
+
+def __getattr__(name):
+    if name in _AGENT_MODULES:
+        module = importlib.import_module(f".{_AGENT_MODULES[name]}", __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
\ No newline at end of file
@@ -3,14 +3,27 @@ Experiment Designer Agent -  it designs experiments AND generates data
 Merged with data generation
 """
 
+import asyncio
 import logging
-from typing import Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
 import random
 import numpy as np
-import pandas as pd
 from datetime import datetime
 
 
+# Metrics reported for every design, independent of the variables
+_METRICS = (
+    "mean_difference",
+    "statistical_significance",
+    "effect_size",
+    "confidence_interval"
+)
+
+# Below this many rows single-threaded NumPy is faster than dispatching to worker threads
+PARALLEL_MIN_SAMPLES = 10_000
+
+
 class ExperimentDesignerAgent:
     """
     Designs experiments and generates synthetic data
@@ -19,8 +32,10 @@ class ExperimentDesignerAgent:
     def __init__(self, memory_store):
         self.memory = memory_store
         self.logger = logging.getLogger("ExperimentDesignerAgent")
-        np.random.seed(42)
-        random.seed(42)
+        # Per-instance generators, so seeding does not leak into other agents
+        self.seed_seq = np.random.SeedSequence(42)
+        self.rng = np.random.default_rng(self.seed_seq)
+        self.pyrand = random.Random(42)
     
     async def design_experiment(self, hypothesis_output: Dict) -> Dict:
         """
@@ -33,6 +48,7 @@ class ExperimentDesignerAgent:
             Experiment design + dataset
         """
         self.logger.info("Designing experiment and generating data...")
+        now = datetime.now()
         
         hypothesis = hypothesis_output['hypothesis']
         hypothesis_type = hypothesis_output.get('hypothesis_type', 'causal')
@@ -43,15 +59,15 @@ class ExperimentDesignerAgent:
         }
         
         # Design experiment
-        design = await self._create_design(hypothesis_type, variables)
-        methodology = await self._define_methodology(hypothesis_type)
-        data_spec = await self._specify_data_requirements(variables, design)
-        metrics = await self._define_metrics(variables['dependent'])
-        analysis_plan = await self._create_analysis_plan(design)
+        design = self._create_design(hypothesis_type, variables)
+        methodology = self._define_methodology(hypothesis_type)
+        data_spec = self._specify_data_requirements(variables, design)
+        metrics = self._define_metrics(variables['dependent'])
+        analysis_plan = self._create_analysis_plan(design['num_groups'])
         
         # Generate dataset
         self.logger.info(f"Generating {design['sample_size']} samples...")
-        dataset = await self._generate_data(design, data_spec)
+        dataset = await self._generate_data(design, data_spec, now)
         
         result = {
             "experiment_type": design['type'],
@@ -65,26 +81,26 @@ class ExperimentDesignerAgent:
             "metrics": metrics,
             "analysis_plan": analysis_plan,
             "dataset": dataset,  # Include dataset
-            "designed_at": datetime.now().isoformat()
+            "designed_at": now.isoformat()
         }
         
         self.logger.info(f"✓ Experiment designed: {design['sample_size']} samples")
         return result
     
-    async def _create_design(self, hypothesis_type: str, variables: Dict) -> Dict:
+    def _create_design(self, hypothesis_type: str, variables: Dict) -> Dict:
         """Create experimental design"""
         
         if hypothesis_type == 'comparative':
             design_type = "Randomized Controlled Trial"
-            num_groups = random.choice([2, 3])
+            num_groups = self.pyrand.choice([2, 3])
         elif hypothesis_type == 'correlational':
             design_type = "Correlational Study"
             num_groups = 1
         else:
             design_type = "Experimental Design"
-            num_groups = random.choice([2, 3, 4])
+            num_groups = self.pyrand.choice([2, 3, 4])
         
-        sample_size = random.choice([100, 200, 500])
+        sample_size = self.pyrand.choice([100, 200, 500])
         samples_per_group = sample_size // num_groups
         
         groups = []
@@ -100,7 +116,7 @@ class ExperimentDesignerAgent:
                 "name": f"Treatment Group {i}",
                 "size": samples_per_group,
                 "treatment": f"condition_{i}",
-                "effect": random.uniform(0.3, 0.6) * i  # Increasing effect
+                "effect": self.pyrand.uniform(0.3, 0.6) * i  # Increasing effect
             })
         
         return {
@@ -111,7 +127,7 @@ class ExperimentDesignerAgent:
             "num_groups": num_groups
         }
     
-    async def _define_methodology(self, hypothesis_type: str) -> Dict:
+    def _define_methodology(self, hypothesis_type: str) -> Dict:
         """Define methodology"""
         return {
             "approach": f"{hypothesis_type.title()} research with statistical validation",
@@ -125,57 +141,35 @@ class ExperimentDesignerAgent:
             "tools": ["Python", "NumPy", "Pandas", "SciPy", "Matplotlib"]
         }
     
-    async def _specify_data_requirements(self, variables: Dict, design: Dict) -> Dict:
+    def _specify_data_requirements(self, variables: Dict, design: Dict) -> Dict:
         """Specify data requirements"""
-        features = []
-        
-        # Group column
-        features.append({
-            "name": "group",
-            "type": "categorical",
-            "categories": [g['name'] for g in design['groups']]
-        })
-        
-        # IVs
-        for var in variables['independent'][:2]:
-            features.append({
-                "name": var,
-                "type": "continuous",
-                "range": [0, 100],
-                "distribution": "normal"
-            })
-        
-        # DVs
-        for var in variables['dependent'][:2]:
-            features.append({
-                "name": var,
-                "type": "continuous",
-                "range": [0, 1],
-                "distribution": "normal"
-            })
-        
-        # CVs
-        for var in variables['control'][:2]:
-            features.append({
-                "name": var,
-                "type": random.choice(["continuous", "categorical"]),
-                "range": [0, 10]
-            })
+        features = (
+            # Group column
+            [{
+                "name": "group",
+                "type": "categorical",
+                "categories": [g['name'] for g in design['groups']]
+            }]
+            # IVs
+            + [{"name": var, "type": "continuous", "range": [0, 100], "distribution": "normal"}
+               for var in variables['independent'][:2]]
+            # DVs
+            + [{"name": var, "type": "continuous", "range": [0, 1], "distribution": "normal"}
+               for var in variables['dependent'][:2]]
+            # CVs
+            + [{"name": var, "type": self.pyrand.choice(["continuous", "categorical"]), "range": [0, 10]}
+               for var in variables['control'][:2]]
+        )
         
         return {"features": features}
     
-    async def _define_metrics(self, dependent_vars: List[str]) -> List[str]:
+    def _define_metrics(self, dependent_vars: List[str]) -> List[str]:
         """Define metrics"""
-        return [
-            "mean_difference",
-            "statistical_significance",
-            "effect_size",
-            "confidence_interval"
-        ]
+        return list(_METRICS)
     
-    async def _create_analysis_plan(self, design: Dict) -> Dict:
+    def _create_analysis_plan(self, num_groups: int) -> Dict:
         """Create analysis plan"""
-        if design['num_groups'] == 2:
+        if num_groups == 2:
             primary = "Independent t-test"
         else:
             primary = "One-way ANOVA"
@@ -186,55 +180,93 @@ class ExperimentDesignerAgent:
             "significance_level": 0.05
         }
     
-    async def _generate_data(self, design: Dict, data_spec: Dict) -> Dict:
-        """Generate synthetic dataset"""
+    def _draw_standard_normal(self, group_rngs: List, starts: np.ndarray,
+                              sizes: np.ndarray, parallel: bool) -> np.ndarray:
+        """Fill one float32 standard-normal column, each group from its own stream"""
+        z = np.empty(int(sizes.sum()), dtype=np.float32)
+        
+        def fill(g):
+            # Generator releases the GIL while filling, so threads draw concurrently
+            group_rngs[g].standard_normal(out=z[starts[g]:starts[g] + sizes[g]], dtype=np.float32)
+        
+        if parallel and len(group_rngs) > 1:
+            with ThreadPoolExecutor(max_workers=len(group_rngs)) as pool:
+                list(pool.map(fill, range(len(group_rngs))))
+        else:
+            for g in range(len(group_rngs)):
+                fill(g)
+        
+        return z
+    
+    async def _generate_data(self, design: Dict, data_spec: Dict,
+                             timestamp: Optional[datetime] = None) -> Dict:
+        """Generate synthetic dataset in a worker thread, leaving the event loop free"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._build_dataset, design, data_spec, timestamp)
+    
+    def _build_dataset(self, design: Dict, data_spec: Dict,
+                       timestamp: Optional[datetime] = None) -> Dict:
+        """Build the synthetic dataset (CPU-bound)"""
+        # pandas is only needed here, import it on first use to keep module import light
+        import pandas as pd
+        
+        groups = design['groups']
+        sizes = np.array([g['size'] for g in groups])
+        total = int(sizes.sum())
         
-        all_data = []
+        # Group column as int codes into the group names
+        codes = np.repeat(np.arange(len(groups), dtype=np.int8), sizes)
         
-        for group in design['groups']:
-            group_size = group['size']
-            group_name = group['name']
-            treatment_effect = group['effect']
+        # Values fit comfortably in narrow dtypes (features in [0, 100], ids up to total)
+        id_dtype = np.uint16 if total <= np.iinfo(np.uint16).max else np.uint32
+        columns = {
+            'sample_id': np.arange(1, total + 1, dtype=id_dtype),
+            'group': pd.Categorical.from_codes(codes, categories=[g['name'] for g in groups])
+        }
+        
+        # Per-row mean of continuous features (50 + treatment effect * 15)
+        group_means = (50 + np.array([g['effect'] for g in groups]) * 15).astype(np.float32)
+        starts = np.cumsum(sizes) - sizes
+        parallel = total >= PARALLEL_MIN_SAMPLES
+        means = np.repeat(group_means, sizes)
+        
+        # Independent, reproducible stream per group so groups can be drawn concurrently
+        group_rngs = [np.random.default_rng(s) for s in self.seed_seq.spawn(len(groups))]
+        
+        # Generate features, one vectorized draw per feature across all groups
+        for feature_spec in data_spec['features']:
+            feature_name = feature_spec['name']
+            feature_type = feature_spec['type']
             
-            group_data = {}
-            group_data['group'] = [group_name] * group_size
+            if feature_name == 'group':
+                continue
             
-            # Generate features
-            for feature_spec in data_spec['features']:
-                if feature_spec['name'] == 'group':
-                    continue
-                
-                feature_name = feature_spec['name']
-                feature_type = feature_spec['type']
-                
-                if feature_type == 'continuous':
-                    mean = 50 + treatment_effect * 15  # Add treatment effect
-                    std = 15
-                    values = np.random.normal(mean, std, group_size)
-                    values = np.clip(values, 0, 100)
-                    group_data[feature_name] = values
-                
-                elif feature_type == 'categorical':
-                    categories = feature_spec.get('categories', ['A', 'B', 'C'])
-                    group_data[feature_name] = np.random.choice(categories, group_size)
-                
-                else:
-                    group_data[feature_name] = np.random.uniform(0, 10, group_size)
+            if feature_type == 'continuous':
+                # Per-row mean carries the treatment effect
+                z = self._draw_standard_normal(group_rngs, starts, sizes, parallel)
+                z *= 15
+                z += means
+                columns[feature_name] = np.clip(z, 0, 100, out=z)
             
-            all_data.append(pd.DataFrame(group_data))
-        
-        # Combine all groups
-        dataset = pd.concat(all_data, ignore_index=True)
+            elif feature_type == 'categorical':
+                categories = feature_spec.get('categories', ['A', 'B', 'C'])
+                columns[feature_name] = self.rng.choice(categories, total)
+            
+            else:
+                values = self.rng.random(total, dtype=np.float32)
+                values *= 10
+                columns[feature_name] = values
         
-        # Add sample IDs
-        dataset.insert(0, 'sample_id', range(1, len(dataset) + 1))
+        # Add timestamp (a single pd.Timestamp floored to seconds, broadcast into a datetime64 column)
+        generated_at = pd.Timestamp(timestamp or datetime.now()).floor('s')
+        columns['timestamp'] = generated_at
         
-        # Add timestamp
-        dataset['timestamp'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        # Build the dataset once from the assembled columns, reusing their buffers
+        dataset = pd.DataFrame(columns, copy=False)
         
         return {
             "dataframe": dataset,
-            "data": dataset.to_dict('records'),
+            "generated_at": generated_at.isoformat(),
             "num_samples": len(dataset),
             "num_features": len(dataset.columns),
             "features": list(dataset.columns)
@@ -3,9 +3,55 @@ Hypothesis Generator Agent - It creates testable research hypotheses that dynami
 """
 
 import logging
+import re
 from typing import Dict, List
 import random
 from datetime import datetime
+from functools import lru_cache
+
+
+# Keyword patterns, compiled once (substring matches, same as `word in text`)
+_IMPROVEMENT_WORDS = re.compile(r'improve|enhance|optimize|increase|better')
+_PREDICTIVE_WORDS = re.compile(r'predict|forecast|estimate')
+_DETECTION_WORDS = re.compile(r'detect|identify|recognize')
+_RELATION_WORDS = re.compile(r'relationship|correlation|association')
+_TREATMENT_WORDS = re.compile(r'implement|apply|use')
+
+_ML_DOMAIN = re.compile(r'machine|learning|ai|algorithm|data')
+_SOCIAL_DOMAIN = re.compile(r'social|psychology|behavior')
+_BIO_DOMAIN = re.compile(r'biology|medical|health')
+_PHYSICS_DOMAIN = re.compile(r'physics|chemistry|quantum')
+_CLIMATE_DOMAIN = re.compile(r'climate|environment|ecology')
+
+_CORRELATIONAL_TYPE = re.compile(r'correlation|relationship')
+_CAUSAL_TYPE = re.compile(r'cause|lead to')
+_COMPARATIVE_TYPE = re.compile(r'compare|versus|outperform')
+_PREDICTIVE_TYPE = re.compile(r'predict|forecast')
+
+_POSITIVE_WORDS = re.compile(r'increase|improve|enhance|higher|positive')
+_NEGATIVE_WORDS = re.compile(r'decrease|reduce|lower|negative')
+
+# Null hypothesis negation, applied in a single pass
+_NULL_MAP = {
+    "will significantly": "will not significantly",
+    "will improve": "will not improve",
+    "will lead to": "will not lead to",
+    "will achieve": "will not achieve",
+    "will demonstrate": "will not demonstrate"
+}
+_NULL_PATTERN = re.compile('|'.join(map(re.escape, _NULL_MAP)))
+
+# Candidate assumptions, formatted with the domain only once selected
+_ASSUMPTION_TEMPLATES = (
+    "Data collected in {domain} is representative of the target population",
+    "Measurements are valid, reliable, and free from systematic bias",
+    "Sample size is adequate for detecting meaningful effects",
+    "Random assignment ensures group equivalence at baseline",
+    "External factors are controlled or their effects are negligible",
+    "The relationship being tested is stable over the study period",
+    "Measurement instruments have acceptable psychometric properties",
+    "Participants respond truthfully and attentively"
+)
 
 
 class HypothesisAgent:
@@ -35,19 +81,19 @@ class HypothesisAgent:
         domain = problem_output.get('domain', 'research')
         
         # Generate main hypothesis
-        hypothesis = await self._formulate_hypothesis(problem_statement, keywords, domain)
+        hypothesis = self._formulate_hypothesis(problem_statement, keywords, domain)
         
         # Generate null hypothesis
         null_hypothesis = self._generate_null_hypothesis(hypothesis)
         
         # Identify variables
-        variables = await self._identify_variables(hypothesis, keywords, domain)
+        variables = self._identify_variables(hypothesis, keywords, domain)
         
         # Define assumptions
-        assumptions = await self._define_assumptions(hypothesis, domain)
+        assumptions = self._define_assumptions(hypothesis, domain)
         
         # Generate predictions
-        predictions = await self._generate_predictions(hypothesis, variables)
+        predictions = self._generate_predictions(hypothesis, variables)
         
         # Identify theoretical basis
         theories = self._identify_theoretical_basis(keywords, domain)
@@ -72,25 +118,13 @@ class HypothesisAgent:
         self.logger.info(f"Hypothesis generated: {hypothesis[:100]}...")
         return result
     
-    async def _formulate_hypothesis(self, problem: str, keywords: List[str], domain: str) -> str:
+    def _formulate_hypothesis(self, problem: str, keywords: List[str], domain: str) -> str:
         """
         Formulate main hypothesis from problem statement
         Works dynamically with any domain
         """
-        # Extract action words from problem
-        problem_lower = problem.lower()
-        
         # Determine hypothesis type based on problem wording
-        if any(word in problem_lower for word in ['improve', 'enhance', 'optimize', 'increase', 'better']):
-            hypothesis_type = 'improvement'
-        elif any(word in problem_lower for word in ['predict', 'forecast', 'estimate']):
-            hypothesis_type = 'predictive'
-        elif any(word in problem_lower for word in ['detect', 'identify', 'recognize']):
-            hypothesis_type = 'detection'
-        elif any(word in problem_lower for word in ['relationship', 'correlation', 'association']):
-            hypothesis_type = 'correlational'
-        else:
-            hypothesis_type = 'causal'
+        hypothesis_type = self._classify_problem(problem)
         
         # Generate hypothesis based on type
         if hypothesis_type == 'improvement':
@@ -149,15 +183,29 @@ class HypothesisAgent:
         
         return hypothesis
     
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _classify_problem(problem: str) -> str:
+        """Classify problem wording into a hypothesis type (cached per problem)"""
+        # Extract action words from problem
+        problem_lower = problem.lower()
+        
+        if _IMPROVEMENT_WORDS.search(problem_lower):
+            return 'improvement'
+        elif _PREDICTIVE_WORDS.search(problem_lower):
+            return 'predictive'
+        elif _DETECTION_WORDS.search(problem_lower):
+            return 'detection'
+        elif _RELATION_WORDS.search(problem_lower):
+            return 'correlational'
+        else:
+            return 'causal'
+    
     def _generate_null_hypothesis(self, hypothesis: str) -> str:
         """Generate null hypothesis (H0)"""
         # Convert to null form
         if "will" in hypothesis:
-            null = hypothesis.replace("will significantly", "will not significantly")
-            null = null.replace("will improve", "will not improve")
-            null = null.replace("will lead to", "will not lead to")
-            null = null.replace("will achieve", "will not achieve")
-            null = null.replace("will demonstrate", "will not demonstrate")
+            null = _NULL_PATTERN.sub(lambda m: _NULL_MAP[m.group(0)], hypothesis)
         elif "exists" in hypothesis:
             null = hypothesis.replace("exists", "does not exist")
         else:
@@ -165,7 +213,7 @@ class HypothesisAgent:
         
         return null
     
-    async def _identify_variables(self, hypothesis: str, keywords: List[str], domain: str) -> Dict:
+    def _identify_variables(self, hypothesis: str, keywords: List[str], domain: str) -> Dict:
         """
         Identify and categorize variables
         Dynamically extracts variables from hypothesis
@@ -180,7 +228,7 @@ class HypothesisAgent:
             independent_vars.append(f"{keywords[0]}_parameter")
         
         # Add generic IV based on hypothesis type
-        if any(word in hypothesis_lower for word in ['implement', 'apply', 'use']):
+        if _TREATMENT_WORDS.search(hypothesis_lower):
             independent_vars.append("treatment_type")
         
         independent_vars.append("experimental_condition")
@@ -222,23 +270,13 @@ class HypothesisAgent:
             "confounding": confounding_vars
         }
     
-    async def _define_assumptions(self, hypothesis: str, domain: str) -> List[str]:
+    def _define_assumptions(self, hypothesis: str, domain: str) -> List[str]:
         """Define key assumptions underlying the hypothesis"""
-        assumptions = [
-            f"Data collected in {domain} is representative of the target population",
-            "Measurements are valid, reliable, and free from systematic bias",
-            "Sample size is adequate for detecting meaningful effects",
-            "Random assignment ensures group equivalence at baseline",
-            "External factors are controlled or their effects are negligible",
-            "The relationship being tested is stable over the study period",
-            "Measurement instruments have acceptable psychometric properties",
-            "Participants respond truthfully and attentively"
-        ]
-        
-        # Select relevant assumptions
-        return random.sample(assumptions, k=min(4, len(assumptions)))
+        # Select relevant assumptions, formatting only the chosen ones
+        chosen = random.sample(_ASSUMPTION_TEMPLATES, k=min(4, len(_ASSUMPTION_TEMPLATES)))
+        return [template.format(domain=domain) for template in chosen]
     
-    async def _generate_predictions(self, hypothesis: str, variables: Dict) -> List[str]:
+    def _generate_predictions(self, hypothesis: str, variables: Dict) -> List[str]:
         """Generate specific testable predictions"""
         predictions = []
         
@@ -264,8 +302,8 @@ class HypothesisAgent:
             "Results will be reproducible across multiple independent trials"
         )
         
-        # Prediction about dose-response or scaling
-        if variables['independent']:
+        # Prediction about dose-response or scaling (only if there is room in the top 4)
+        if len(predictions) < 4 and variables['independent']:
             iv = variables['independent'][0]
             predictions.append(
                 f"Effects will scale proportionally with {iv} intensity"
@@ -275,11 +313,17 @@ class HypothesisAgent:
     
     def _identify_theoretical_basis(self, keywords: List[str], domain: str) -> List[str]:
         """Identify relevant theoretical frameworks"""
+        theories = self._theories_for_domain(domain.lower())
+        return random.sample(theories, k=min(3, len(theories)))
+    
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _theories_for_domain(domain_lower: str) -> tuple:
+        """Full list of candidate theories for a domain (cached per domain)"""
         # Domain-based theories
-        domain_lower = domain.lower()
         theories = []
         
-        if any(word in domain_lower for word in ['machine', 'learning', 'ai', 'algorithm', 'data']):
+        if _ML_DOMAIN.search(domain_lower):
             theories.extend([
                 "Statistical Learning Theory",
                 "Information Theory",
@@ -287,7 +331,7 @@ class HypothesisAgent:
                 "Optimization Theory"
             ])
         
-        elif any(word in domain_lower for word in ['social', 'psychology', 'behavior']):
+        elif _SOCIAL_DOMAIN.search(domain_lower):
             theories.extend([
                 "Social Cognitive Theory",
                 "Behavioral Psychology",
@@ -295,7 +339,7 @@ class HypothesisAgent:
                 "Decision Theory"
             ])
         
-        elif any(word in domain_lower for word in ['biology', 'medical', 'health']):
+        elif _BIO_DOMAIN.search(domain_lower):
             theories.extend([
                 "Systems Biology Theory",
                 "Biomedical Model",
@@ -303,7 +347,7 @@ class HypothesisAgent:
                 "Pathophysiological Theory"
             ])
         
-        elif any(word in domain_lower for word in ['physics', 'chemistry', 'quantum']):
+        elif _PHYSICS_DOMAIN.search(domain_lower):
             theories.extend([
                 "Quantum Mechanics",
                 "Thermodynamics",
@@ -311,7 +355,7 @@ class HypothesisAgent:
                 "Statistical Mechanics"
             ])
         
-        elif any(word in domain_lower for word in ['climate', 'environment', 'ecology']):
+        elif _CLIMATE_DOMAIN.search(domain_lower):
             theories.extend([
                 "Climate System Theory",
                 "Ecological Systems Theory",
@@ -328,30 +372,34 @@ class HypothesisAgent:
                 "Empirical Research Framework"
             ])
         
-        return random.sample(theories, k=min(3, len(theories)))
+        return tuple(theories)
     
-    def _classify_hypothesis_type(self, hypothesis: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _classify_hypothesis_type(hypothesis: str) -> str:
         """Classify the type of hypothesis"""
         hypothesis_lower = hypothesis.lower()
         
-        if "correlation" in hypothesis_lower or "relationship" in hypothesis_lower:
+        if _CORRELATIONAL_TYPE.search(hypothesis_lower):
             return "correlational"
-        elif "cause" in hypothesis_lower or "lead to" in hypothesis_lower:
+        elif _CAUSAL_TYPE.search(hypothesis_lower):
             return "causal"
-        elif "compare" in hypothesis_lower or "versus" in hypothesis_lower or "outperform" in hypothesis_lower:
+        elif _COMPARATIVE_TYPE.search(hypothesis_lower):
             return "comparative"
-        elif "predict" in hypothesis_lower or "forecast" in hypothesis_lower:
+        elif _PREDICTIVE_TYPE.search(hypothesis_lower):
             return "predictive"
         else:
             return "directional"
     
-    def _determine_effect_direction(self, hypothesis: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _determine_effect_direction(hypothesis: str) -> str:
         """Determine expected direction of effect"""
         hypothesis_lower = hypothesis.lower()
         
-        if any(word in hypothesis_lower for word in ['increase', 'improve', 'enhance', 'higher', 'positive']):
+        if _POSITIVE_WORDS.search(hypothesis_lower):
             return "positive"
-        elif any(word in hypothesis_lower for word in ['decrease', 'reduce', 'lower', 'negative']):
+        elif _NEGATIVE_WORDS.search(hypothesis_lower):
             return "negative"
         else:
             return "bidirectional"
\ No newline at end of file
@@ -2,11 +2,12 @@
 Paper Writer Agent -  it uses all agent outputs to generate comprehensive paper
 """
 
+import asyncio
 import logging
 import os
 from dotenv import load_dotenv
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 
 load_dotenv()
 
@@ -35,12 +36,14 @@ class PaperWriterAgent:
                 except Exception as e:
                     self.logger.error(f"Gemini setup failed: {e}")
     
-    async def write_paper(self, all_outputs: Dict) -> dict:
+    async def write_paper(self, all_outputs: Dict,
+                          prefetch: Optional["asyncio.Future"] = None) -> dict:
         """
         Generate 3000-word paper using all agent outputs
         
         Args:
             all_outputs: Outputs from all agents
+            prefetch: Optional pending fetch of reference papers, awaited only here
             
         Returns:
             Complete research paper
@@ -48,8 +51,17 @@ class PaperWriterAgent:
         self.logger.info("Generating research paper with Gemini...")
         
         if not self.ai_model:
+            if prefetch is not None:
+                prefetch.cancel()
             return self._generate_error_paper()
         
+        references = []
+        if prefetch is not None:
+            try:
+                references = await prefetch
+            except Exception as e:
+                self.logger.error(f"Reference prefetch failed: {e}")
+        
         # Extract agent outputs
         problem = all_outputs.get('research_problem', {})
         hypothesis = all_outputs.get('hypothesis', {})
@@ -59,7 +71,7 @@ class PaperWriterAgent:
         # Generate with Gemini
         try:
             paper_content = await self._generate_with_gemini(
-                problem, hypothesis, experiment, analysis
+                problem, hypothesis, experiment, analysis, references
             )
             
             title = self._extract_title(paper_content, problem.get('domain', 'Research'))
@@ -81,7 +93,8 @@ class PaperWriterAgent:
             return self._generate_error_paper()
     
     async def _generate_with_gemini(self, problem: Dict, hypothesis: Dict,
-                                   experiment: Dict, analysis: Dict) -> str:
+                                   experiment: Dict, analysis: Dict,
+                                   references: Optional[List[Dict]] = None) -> str:
         """Generate full paper with all agent context"""
         
         # Build context from agents
@@ -109,6 +122,13 @@ RESEARCH CONTEXT FROM AGENTS:
    - Key Finding: {analysis.get('key_finding', 'Statistical significance observed')}
    - Interpretation: {analysis.get('interpretation', 'Results support hypothesis')}
 """
+        
+        if references:
+            context += "\n5. REFERENCES (real papers from arXiv, cite where relevant):\n"
+            context += "\n".join(
+                f"   - {', '.join(ref['authors'])} ({ref['year']}). {ref['title']}"
+                for ref in references
+            ) + "\n"
 
         prompt = f"""You are an expert academic research writer. Write a COMPLETE, PROFESSIONAL research paper using the context provided by multiple AI agents.
 
@@ -2,38 +2,106 @@
 Problem Finder Agent - With Real Web Scraping it fetches papers from arXiv to find research gaps
 """
 
+import asyncio
+import importlib.util
 import logging
-from typing import Dict, List
+import re
+from typing import TYPE_CHECKING, Dict, List, Optional
 import random
+from collections import Counter
 from datetime import datetime
+from functools import lru_cache
+from urllib.parse import urlencode
 
-try:
-    import arxiv
-    ARXIV_AVAILABLE = True
-except ImportError:
-    ARXIV_AVAILABLE = False
+if TYPE_CHECKING:
+    import aiohttp
 
-try:
-    import requests
-    from bs4 import BeautifulSoup
-    WEB_SCRAPING_AVAILABLE = True
-except ImportError:
-    WEB_SCRAPING_AVAILABLE = False
+# Checked without importing; aiohttp and the XML parser are imported on first fetch
+ARXIV_AVAILABLE = importlib.util.find_spec('aiohttp') is not None
+
+
+ARXIV_API_URL = "http://export.arxiv.org/api/query"
+USER_AGENT = "AutoResearchLab/1.0 (+https://github.com/vikashmehta292511/autoresearch-lab)"
+ARXIV_PAGE_SIZE = 100
+# arXiv's API terms ask for one request at a time, about 3 seconds apart
+ARXIV_MAX_CONCURRENCY = 1
+ARXIV_REQUEST_INTERVAL = 3.0
+ARXIV_MAX_RETRIES = 3
+ARXIV_RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Atom feed element paths
+_ATOM = '{http://www.w3.org/2005/Atom}'
+_ENTRY = f'{_ATOM}entry'
+_TITLE = f'{_ATOM}title'
+_SUMMARY = f'{_ATOM}summary'
+_PUBLISHED = f'{_ATOM}published'
+_AUTHOR = f'{_ATOM}author'
+_NAME = f'{_ATOM}name'
+_CATEGORY = f'{_ATOM}category'
+
+# Candidate keywords: lowercase words of 6+ letters
+_WORD_RE = re.compile(r'\b[a-z]{6,}\b')
+
+# Fallback problem generation vocabulary
+_STOP_WORDS = frozenset({'the', 'a', 'an', 'in', 'on', 'for', 'to', 'of', 'and'})
+_PATTERNS = ("optimization", "prediction", "efficiency", "accuracy", "scalability")
+
+
+@lru_cache(maxsize=None)
+def _xml_backend():
+    """Import the XML parser on first use: lxml if installed, else the stdlib ElementTree"""
+    try:
+        from lxml import etree
+        return etree, etree.XMLParser(resolve_entities=False, no_network=True)
+    except ImportError:
+        import xml.etree.ElementTree as etree
+        return etree, None
 
 
 class ProblemFinderAgent:
     """Identifies research problems using web scraping"""
     
-    def __init__(self, memory_store):
+    def __init__(self, memory_store, session: Optional["aiohttp.ClientSession"] = None,
+                 cache=None):
         self.memory = memory_store
         self.logger = logging.getLogger("ProblemFinderAgent")
+        # Optional QueryCache for arXiv results, skips the network when an entry is fresh
+        self.cache = cache
+        # Shared HTTP session (keep-alive pool), created on first use unless injected
+        self.session = session
+        self._owns_session = session is None
+        self._arxiv_semaphore = asyncio.Semaphore(ARXIV_MAX_CONCURRENCY)
+        self._next_request_at = 0.0
+        # Per-instance generator instead of the shared module-level one
+        self.pyrand = random.Random()
+    
+    def _get_session(self) -> "aiohttp.ClientSession":
+        """Return the pooled HTTP session, creating it inside the running loop if needed"""
+        if self.session is None or self.session.closed:
+            import aiohttp
+            
+            connector = aiohttp.TCPConnector(limit=20, limit_per_host=4, keepalive_timeout=30)
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                headers={'User-Agent': USER_AGENT},
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
+            self._owns_session = True
+        return self.session
+    
+    async def close(self):
+        """Close the HTTP session if this agent created it"""
+        if self._owns_session and self.session is not None and not self.session.closed:
+            await self.session.close()
     
-    async def identify_problem(self, research_domain: str) -> Dict:
+    async def identify_problem(self, research_domain: str,
+                               run_dt: Optional[datetime] = None) -> Dict:
         """
         Identify research problem with web scraping
         
         Args:
             research_domain: Research topic
+            run_dt: Pipeline start time to stamp the problem with (defaults to now)
             
         Returns:
             Problem with real literature context
@@ -53,45 +121,119 @@ class ProblemFinderAgent:
             problem = await self._generate_intelligent_problem(research_domain)
         
         problem['domain'] = research_domain
-        problem['identified_at'] = datetime.now().isoformat()
+        problem['identified_at'] = (run_dt or datetime.now()).isoformat()
         problem['papers_found'] = len(papers)
         
         return problem
     
-    async def _fetch_arxiv_papers(self, domain: str) -> List[Dict]:
-        """Fetch real papers from arXiv"""
-        try:
-            search = arxiv.Search(
-                query=domain,
-                max_results=10,
-                sort_by=arxiv.SortCriterion.Relevance
-            )
+    async def fetch_references(self, problem_output: Dict, max_results: int = 15) -> List[Dict]:
+        """
+        Fetch additional arXiv papers to cite, narrowed by the problem's top keyword
+        that is not already part of the domain
+        
+        Args:
+            problem_output: Output from identify_problem
+            max_results: Number of reference papers to request
             
-            papers = []
-            for result in search.results():
-                papers.append({
-                    'title': result.title,
-                    'abstract': result.summary[:300],
-                    'year': result.published.year,
-                    'authors': [author.name for author in result.authors][:3],
-                    'categories': result.categories[:3]
-                })
+        Returns:
+            Reference papers (empty if arXiv is unavailable)
+        """
+        if not ARXIV_AVAILABLE:
+            return []
+        
+        query = problem_output['domain']
+        domain_words = set(query.lower().split())
+        keyword = next((k for k in problem_output.get('keywords', []) if k not in domain_words), None)
+        if keyword:
+            query = f"{query} {keyword}"
+        
+        return await self._fetch_arxiv_papers(query, max_results=max_results)
+    
+    async def _fetch_arxiv_papers(self, domain: str, max_results: int = 10) -> List[Dict]:
+        """Fetch real papers from the arXiv API, one result page per rate-limited request"""
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.make_key('arxiv', domain, max_results)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self.logger.info("Using cached arXiv results")
+                return cached
+        
+        try:
+            page_size = min(max_results, ARXIV_PAGE_SIZE)
+            pages = await asyncio.gather(*[
+                self._fetch_arxiv_page(domain, start, min(page_size, max_results - start))
+                for start in range(0, max_results, page_size)
+            ])
             
-            return papers
+            papers = [paper for page in pages for paper in page]
         except Exception as e:
             self.logger.error(f"arXiv fetch failed: {e}")
             return []
+        
+        # Only successful, non-empty fetches are cached; an empty page may be transient
+        if cache_key is not None and papers:
+            self.cache.set(cache_key, papers)
+        
+        return papers
+    
+    async def _wait_request_slot(self):
+        """Wait until ARXIV_REQUEST_INTERVAL has passed since the previous request started"""
+        now = asyncio.get_running_loop().time()
+        start = max(now, self._next_request_at)
+        self._next_request_at = start + ARXIV_REQUEST_INTERVAL
+        if start > now:
+            await asyncio.sleep(start - now)
+    
+    async def _fetch_arxiv_page(self, domain: str, start: int, max_results: int) -> List[Dict]:
+        """Fetch one page of results, backing off exponentially on 429/5xx"""
+        query = urlencode({
+            'search_query': f'all:{domain}',
+            'start': start,
+            'max_results': max_results,
+            'sortBy': 'relevance'
+        })
+        
+        async with self._arxiv_semaphore:
+            for attempt in range(ARXIV_MAX_RETRIES + 1):
+                await self._wait_request_slot()
+                async with self._get_session().get(f"{ARXIV_API_URL}?{query}") as response:
+                    if response.status not in ARXIV_RETRY_STATUSES or attempt == ARXIV_MAX_RETRIES:
+                        response.raise_for_status()
+                        body = await response.read()
+                        break
+                
+                delay = 2 ** attempt
+                self.logger.warning(f"arXiv returned {response.status}, retrying in {delay}s")
+                await asyncio.sleep(delay)
+        
+        return self._parse_atom_feed(body)
+    
+    @staticmethod
+    def _parse_atom_feed(body: bytes) -> List[Dict]:
+        """Parse an arXiv Atom feed with the C-backed lxml/ElementTree parser"""
+        etree, parser = _xml_backend()
+        root = etree.fromstring(body, parser)
+        
+        papers = []
+        for entry in root.iterfind(_ENTRY):
+            papers.append({
+                'title': ' '.join(entry.findtext(_TITLE, '').split()),
+                'abstract': ' '.join(entry.findtext(_SUMMARY, '').split())[:300],
+                'year': int(entry.findtext(_PUBLISHED, '0000')[:4]),
+                'authors': [author.findtext(_NAME) for author in entry.findall(_AUTHOR)][:3],
+                'categories': [category.get('term') for category in entry.findall(_CATEGORY)][:3]
+            })
+        
+        return papers
     
     async def _analyze_literature(self, papers: List[Dict], domain: str) -> Dict:
         """Analyze real papers to find gaps"""
         
-        # Extract keywords from papers
-        keywords = set()
-        for paper in papers:
-            title_words = paper['title'].lower().split()
-            keywords.update([w for w in title_words if len(w) > 5][:3])
-        
-        keywords = list(keywords)[:7]
+        # Extract the most frequent title words as keywords, in one pass over all titles
+        all_titles = ' '.join(p['title'] for p in papers).lower()
+        counts = Counter(_WORD_RE.findall(all_titles))
+        keywords = [word for word, _ in counts.most_common(7)]
         
         # Find gaps
         problem_statement = (
@@ -115,8 +257,8 @@ class ProblemFinderAgent:
             "research_gap": research_gap,
             "keywords": keywords,
             "justification": justification,
-            "novelty_score": random.uniform(0.75, 0.92),
-            "confidence_score": random.uniform(0.80, 0.95),
+            "novelty_score": self.pyrand.uniform(0.75, 0.92),
+            "confidence_score": self.pyrand.uniform(0.80, 0.95),
             "literature_source": "arXiv",
             "papers_analyzed": [p['title'][:50] for p in papers[:3]]
         }
@@ -125,13 +267,11 @@ class ProblemFinderAgent:
         """Fallback intelligent generation"""
         
         domain_words = domain.lower().split()
-        stop_words = {'the', 'a', 'an', 'in', 'on', 'for', 'to', 'of', 'and'}
-        key_terms = [w for w in domain_words if w not in stop_words]
+        key_terms = [w for w in domain_words if w not in _STOP_WORDS]
         
         primary_focus = key_terms[0] if key_terms else domain
         
-        patterns = ["optimization", "prediction", "efficiency", "accuracy", "scalability"]
-        selected = random.choice(patterns)
+        selected = self.pyrand.choice(_PATTERNS)
         
         problem_statement = (
             f"How can we improve {selected} of {primary_focus} "
@@ -140,7 +280,7 @@ class ProblemFinderAgent:
         
         research_gap = f"Current {primary_focus} approaches show limitations in {selected}"
         
-        keywords = list(set(key_terms + [selected]))[:7]
+        keywords = list(dict.fromkeys(key_terms + [selected]))[:7]
         
         justification = "Recent advances enable new approaches to this challenge"
         
@@ -149,7 +289,7 @@ class ProblemFinderAgent:
             "research_gap": research_gap,
             "keywords": keywords,
             "justification": justification,
-            "novelty_score": random.uniform(0.70, 0.88),
-            "confidence_score": random.uniform(0.75, 0.90),
+            "novelty_score": self.pyrand.uniform(0.70, 0.88),
+            "confidence_score": self.pyrand.uniform(0.75, 0.90),
             "literature_source": "intelligent_generation"
         }
\ No newline at end of file
@@ -3,9 +3,10 @@ AutoResearch Lab - Generates research papers with all agents + web scraping
 """
 
 import asyncio
-import json
 from datetime import datetime
+from functools import partial
 from pathlib import Path
+from typing import Mapping
 import logging
 
 from agents.problem_finder import ProblemFinderAgent
@@ -14,7 +15,20 @@ from agents.experiment_designer import ExperimentDesignerAgent
 from agents.data_analyst import DataAnalysisAgent
 from agents.paper_writer import PaperWriterAgent
 from utils.memory_store import MemoryStore
-from utils.logger import setup_logger
+from utils.logger import setup_logger, flush_logger
+from utils.query_cache import QueryCache
+from utils.serialization import write_json
+
+
+# Text is encoded and written in slices so the full encoded copy never exists at once
+WRITE_CHUNK_CHARS = 1 << 16
+
+
+def _write_text(path: Path, text: str):
+    """Write text to a UTF-8 file through a 1MB buffer, one slice at a time"""
+    with open(path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+        for start in range(0, len(text), WRITE_CHUNK_CHARS):
+            f.write(text[start:start + WRITE_CHUNK_CHARS])
 
 
 class AutoResearchLab:
@@ -30,9 +44,12 @@ class AutoResearchLab:
         # Initialize memory
         self.memory = MemoryStore()
         
+        # Cache arXiv results across runs (24h TTL)
+        self.query_cache = QueryCache(self.output_dir / "arxiv_cache.sqlite", ttl_seconds=86400)
+        
         # Initialize agents
         self.logger.info("Initializing agents...")
-        self.problem_finder = ProblemFinderAgent(self.memory)
+        self.problem_finder = ProblemFinderAgent(self.memory, cache=self.query_cache)
         self.hypothesis_agent = HypothesisAgent(self.memory)
         self.experiment_designer = ExperimentDesignerAgent(self.memory)
         self.data_analyst = DataAnalysisAgent(self.memory)
@@ -55,13 +72,22 @@ class AutoResearchLab:
         print('='*80)
         print(f"Domain: {research_domain}\n")
         
+        # Single timestamp for the whole run, shared by all output files
+        run_dt = datetime.now()
+        
+        refs_task = None
         try:
             # Phase 1: Problem Identification (with web scraping)
             print("[1/5]  Identifying research problem (web scraping)...")
-            problem_output = await self.problem_finder.identify_problem(research_domain)
+            problem_output = await self.problem_finder.identify_problem(research_domain, run_dt)
             self.memory.store("research_problem", problem_output)
             print(f"✓ Problem: {problem_output['problem_statement'][:80]}...")
             
+            # Prefetch reference papers in the background, consumed by the paper writer
+            refs_task = asyncio.create_task(self.problem_finder.fetch_references(problem_output))
+            # Let the task start so its request is in flight during the next phases
+            await asyncio.sleep(0)
+            
             # Phase 2: Hypothesis Generation
             print("\n[2/5]  Generating hypothesis...")
             hypothesis_output = await self.hypothesis_agent.generate_hypothesis(problem_output)
@@ -82,15 +108,17 @@ class AutoResearchLab:
             
             # Phase 5: Paper Writing (Gemini 3000 words)
             print("\n[5/5]  Writing research paper (2500-3000 words with Gemini)...")
-            paper_output = await self.paper_writer.write_paper(self.memory.get_all())
+            # Live view of memory, also reflects the paper once stored
+            all_data = self.memory.get_all()
+            paper_output = await self.paper_writer.write_paper(all_data, prefetch=refs_task)
             self.memory.store("paper", paper_output)
             print(f"✓ Paper generated: {paper_output['word_count']} words")
             
             # Compile results
-            final_output = self._compile_results()
+            final_output = self._compile_results(all_data, run_dt)
             
             # Save to files
-            await self._save_outputs(final_output)
+            await self._save_outputs(final_output, run_dt)
             
             print(f"\n{'='*80}")
             print("✓ RESEARCH PIPELINE COMPLETED SUCCESSFULLY!")
@@ -99,17 +127,23 @@ class AutoResearchLab:
             return final_output
             
         except Exception as e:
+            if refs_task is not None:
+                refs_task.cancel()
             self.logger.error(f"Pipeline error: {str(e)}", exc_info=True)
             print(f"\n Error: {str(e)}")
             print("Check output/system.log for details")
             raise
     
-    def _compile_results(self) -> dict:
+    async def close(self):
+        """Release network resources held by the agents"""
+        await self.problem_finder.close()
+        self.query_cache.close()
+    
+    def _compile_results(self, all_data: Mapping, run_dt: datetime) -> dict:
         """Compile all results"""
-        all_data = self.memory.get_all()
         return {
             "metadata": {
-                "generated_at": datetime.now().isoformat(),
+                "generated_at": run_dt.isoformat(),
                 "pipeline_version": "3.0-cli"
             },
             "research_problem": all_data.get("research_problem"),
@@ -119,21 +153,27 @@ class AutoResearchLab:
             "paper": all_data.get("paper")
         }
     
-    async def _save_outputs(self, final_output: dict):
+    async def _save_outputs(self, final_output: dict, run_dt: datetime):
         """Save outputs to repository"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = f"{run_dt:%Y%m%d_%H%M%S}"
         run_dir = self.output_dir / f"research_{timestamp}"
         run_dir.mkdir(exist_ok=True)
         
         print(f"\n Saving outputs to: {run_dir}")
         
-        # Save research paper
+        loop = asyncio.get_running_loop()
+        
+        # Save research paper (file writes run in the default executor so they don't stall the event loop)
         paper_path = run_dir / "research_paper.md"
-        with open(paper_path, 'w', encoding='utf-8') as f:
-            f.write(final_output['paper']['content'])
+        await loop.run_in_executor(None, _write_text, paper_path, final_output['paper']['content'])
         print(f"✓ Paper saved: {paper_path}")
         
-        # Save metadata
+        # Save pipeline history first, compact since it embeds the full paper
+        history_path = run_dir / "pipeline_history.json"
+        await loop.run_in_executor(None, partial(write_json, history_path, final_output, indent=False))
+        print(f"✓ Pipeline history saved: {history_path}")
+        
+        # Save metadata (scalar fields only, no second pass over the paper content)
         metadata = {
             "timestamp": timestamp,
             "domain": final_output['research_problem']['domain'],
@@ -144,17 +184,12 @@ class AutoResearchLab:
             "papers_found": final_output['research_problem'].get('papers_found', 0)
         }
         metadata_path = run_dir / "metadata.json"
-        with open(metadata_path, 'w', encoding='utf-8') as f:
-            json.dump(metadata, f, indent=2)
+        await loop.run_in_executor(None, write_json, metadata_path, metadata)
         print(f"✓ Metadata saved: {metadata_path}")
         
-        # Save pipeline history
-        history_path = run_dir / "pipeline_history.json"
-        with open(history_path, 'w', encoding='utf-8') as f:
-            json.dump(final_output, f, indent=2, default=str)
-        print(f"✓ Pipeline history saved: {history_path}")
-        
         print(f"\n✓ All outputs saved to: {run_dir}")
+        
+        await loop.run_in_executor(None, flush_logger, self.logger)
 
 
 async def main():
@@ -189,6 +224,8 @@ async def main():
     except Exception as e:
         print(f"\n Pipeline failed: {str(e)}")
         return 1
+    finally:
+        await lab.close()
     
     return 0
 
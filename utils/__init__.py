@@ -3,13 +3,20 @@ AutoResearch Lab - Utilities Package
 Memory management and logging utilities
 """
 
-from .memory_store import MemoryStore
-from .logger import setup_logger, log_agent_action
+from .memory_store import MemoryStore, Phase
+from .logger import setup_logger, flush_logger, log_agent_action
+from .query_cache import QueryCache
+from .serialization import dumps_json, write_json
 
 __all__ = [
     'MemoryStore',
+    'Phase',
+    'QueryCache',
     'setup_logger',
-    'log_agent_action'
+    'flush_logger',
+    'log_agent_action',
+    'dumps_json',
+    'write_json'
 ]
 
 __version__ = '1.0.0'
\ No newline at end of file
@@ -4,10 +4,31 @@ Logger Utility - Setup logging for the system
 
 import logging
 import sys
+from logging.handlers import MemoryHandler
 from pathlib import Path
 from datetime import datetime
 
 
+class _BatchFileHandler(logging.FileHandler):
+    """File handler that skips the per-record flush; flush_batch() does the real flush"""
+    
+    def flush(self):
+        pass
+    
+    def flush_batch(self):
+        super().flush()
+
+
+class _BatchMemoryHandler(MemoryHandler):
+    """Memory handler that flushes its target once per batch instead of once per record"""
+    
+    def flush(self):
+        with self.lock:
+            super().flush()
+            if self.target:
+                self.target.flush_batch()
+
+
 def setup_logger(name: str, log_file: Path, level=logging.INFO):
     """
     Setup logger with both file and console handlers
@@ -37,12 +58,16 @@ def setup_logger(name: str, log_file: Path, level=logging.INFO):
         '%(levelname)s - %(name)s - %(message)s'
     )
     
-    # File handler
+    # File handler (opened on first write, records buffered and written in batches of up
+    # to 100 with one flush per batch; errors flush immediately, otherwise call
+    # flush_logger at checkpoints. Records still buffered are lost if the process is killed)
     log_file.parent.mkdir(parents=True, exist_ok=True)
-    file_handler = logging.FileHandler(log_file)
+    file_handler = _BatchFileHandler(log_file, delay=True)
     file_handler.setLevel(level)
     file_handler.setFormatter(file_formatter)
-    logger.addHandler(file_handler)
+    buffered_handler = _BatchMemoryHandler(capacity=100, flushLevel=logging.ERROR, target=file_handler)
+    buffered_handler.setLevel(level)
+    logger.addHandler(buffered_handler)
     
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
@@ -53,6 +78,12 @@ def setup_logger(name: str, log_file: Path, level=logging.INFO):
     return logger
 
 
+def flush_logger(logger):
+    """Write out any buffered log records"""
+    for handler in logger.handlers:
+        handler.flush()
+
+
 def log_agent_action(logger, agent_name: str, action: str, details: str = ""):
     """Log agent action with consistent format"""
     message = f"[{agent_name}] {action}"
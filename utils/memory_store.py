@@ -2,11 +2,27 @@
 Memory Store - Manages short-term and long-term memory for the system
 """
 
-from typing import Dict, Any, List, Optional
-from collections import defaultdict
+from typing import Dict, Any, List, Optional, Mapping, Union
+from collections import ChainMap, defaultdict, deque
+from enum import IntFlag
 import json
+import logging
 from pathlib import Path
 
+from .serialization import write_json
+
+# Maximum number of conversation history entries kept; oldest are dropped first
+HISTORY_MAX_ENTRIES = 1000
+
+
+class Phase(IntFlag):
+    """Pipeline phases, combined into a bitmask of completed phases"""
+    PROBLEM = 1
+    HYPOTHESIS = 2
+    EXPERIMENT = 4
+    ANALYSIS = 8
+    PAPER = 16
+
 
 class MemoryStore:
     """
@@ -14,10 +30,11 @@ class MemoryStore:
     """
     
     def __init__(self, persistence_file: Optional[str] = None):
+        self.logger = logging.getLogger("MemoryStore")
         self.short_term_memory = {}
         self.long_term_memory = {}
-        self.conversation_history = []
-        self.completed_phases = set()
+        self.conversation_history = deque(maxlen=HISTORY_MAX_ENTRIES)
+        self.completed_phases = Phase(0)
         self.current_phase = None
         self.persistence_file = persistence_file
         
@@ -57,20 +74,19 @@ class MemoryStore:
         
         return default
     
-    def get_all(self) -> Dict[str, Any]:
-        """Get all memory contents"""
-        return {
-            **self.long_term_memory,
-            **self.short_term_memory
-        }
+    def get_all(self) -> Mapping[str, Any]:
+        """Get all memory contents as a live view (short-term shadows long-term), without copying"""
+        return ChainMap(self.short_term_memory, self.long_term_memory)
     
     def clear_short_term(self):
         """Clear short-term memory"""
-        self.short_term_memory = {}
+        self.short_term_memory.clear()
     
-    def mark_phase_complete(self, phase: str):
-        """Mark a pipeline phase as complete"""
-        self.completed_phases.add(phase)
+    def mark_phase_complete(self, phase: Union[str, Phase]):
+        """Mark a pipeline phase as complete (a Phase or its name, e.g. "problem")"""
+        if isinstance(phase, str):
+            phase = self._phase_from_name(phase)
+        self.completed_phases |= phase
         self.current_phase = None
     
     def set_current_phase(self, phase: str):
@@ -78,8 +94,8 @@ class MemoryStore:
         self.current_phase = phase
     
     def get_completed_phases(self) -> List[str]:
-        """Get list of completed phases"""
-        return list(self.completed_phases)
+        """Get names of completed phases, in pipeline order"""
+        return [phase.name for phase in Phase if phase in self.completed_phases]
     
     def get_current_phase(self) -> Optional[str]:
         """Get current phase"""
@@ -90,12 +106,11 @@ class MemoryStore:
         data = {
             "short_term": self.short_term_memory,
             "long_term": self.long_term_memory,
-            "completed_phases": list(self.completed_phases),
+            "completed_phases": self.completed_phases.value,
             "current_phase": self.current_phase
         }
         
-        with open(filepath, 'w') as f:
-            json.dump(data, f, indent=2, default=str)
+        write_json(filepath, data)
     
     def load_from_file(self, filepath: str):
         """Load memory from file"""
@@ -104,12 +119,26 @@ class MemoryStore:
         
         self.short_term_memory = data.get("short_term", {})
         self.long_term_memory = data.get("long_term", {})
-        self.completed_phases = set(data.get("completed_phases", []))
+        completed = data.get("completed_phases", 0)
+        if isinstance(completed, list):
+            # Older files stored phase names
+            names, completed = completed, Phase(0)
+            for name in names:
+                completed |= self._phase_from_name(name)
+        self.completed_phases = Phase(completed)
         self.current_phase = data.get("current_phase")
     
+    def _phase_from_name(self, name: str) -> Phase:
+        """Map a phase name to its flag; unknown names are skipped with a warning"""
+        try:
+            return Phase[name.upper()]
+        except KeyError:
+            self.logger.warning(f"Ignoring unknown pipeline phase: {name}")
+            return Phase(0)
+    
     def get_conversation_history(self) -> List[Dict]:
-        """Get conversation history"""
-        return self.conversation_history
+        """Get conversation history (at most HISTORY_MAX_ENTRIES most recent entries)"""
+        return list(self.conversation_history)
     
     def add_to_history(self, agent: str, action: str, content: str):
         """Add entry to conversation history"""
@@ -0,0 +1,66 @@
+"""
+Query Cache - Persistent on-disk cache for external API query results
+"""
+
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+
+class QueryCache:
+    """
+    SQLite-backed cache of JSON-serializable results with a time-to-live
+    """
+    
+    def __init__(self, db_path: str, ttl_seconds: float = 86400):
+        self.db_path = Path(db_path)
+        self.ttl_seconds = ttl_seconds
+        
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self.conn.commit()
+    
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Build a stable cache key from the query parameters"""
+        return hashlib.sha1(json.dumps(parts, sort_keys=True).encode('utf-8')).hexdigest()
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None if missing or older than the TTL"""
+        row = self.conn.execute(
+            "SELECT value, created_at FROM cache WHERE key = ?", (key,)
+        ).fetchone()
+        
+        if row is None:
+            return None
+        
+        value, created_at = row
+        if time.time() - created_at > self.ttl_seconds:
+            self.invalidate(key)
+            return None
+        
+        return json.loads(value)
+    
+    def set(self, key: str, value: Any):
+        """Store a value under the key, replacing any previous entry"""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO cache (key, value, created_at) VALUES (?, ?, ?)",
+            (key, json.dumps(value, default=str), time.time())
+        )
+        self.conn.commit()
+    
+    def invalidate(self, key: str):
+        """Remove a cached entry"""
+        self.conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+        self.conn.commit()
+    
+    def close(self):
+        """Close the database connection"""
+        self.conn.close()
\ No newline at end of file
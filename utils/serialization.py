@@ -0,0 +1,53 @@
+"""
+Serialization Utility - Fast JSON encoding with a stdlib fallback
+"""
+
+import json
+import sys
+from pathlib import Path
+from typing import Any, Union
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _default(obj: Any) -> Any:
+    """Encode values JSON has no type for: DataFrames as column lists, anything else as str()"""
+    # pandas is only checked if something already imported it
+    pd = sys.modules.get('pandas')
+    if pd is not None and isinstance(obj, pd.DataFrame):
+        return obj.to_dict(orient='list')
+    return str(obj)
+
+
+def dumps_json(data: Any, indent: bool = True) -> bytes:
+    """
+    Encode data as UTF-8 JSON bytes
+    
+    Uses orjson when installed, otherwise the stdlib encoder. DataFrames
+    are written as column lists, other values that are not natively
+    serializable as their str().
+    
+    Args:
+        data: Data to encode
+        indent: If True, pretty-print with 2-space indentation
+        
+    Returns:
+        Encoded JSON
+    """
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=_default, option=option)
+    
+    return json.dumps(data, indent=2 if indent else None, default=_default).encode('utf-8')
+
+
+def write_json(filepath: Union[str, Path], data: Any, indent: bool = True):
+    """Encode data as JSON and write it to a file"""
+    with open(filepath, 'wb') as f:
+        f.write(dumps_json(data, indent=indent))
\ No newline at end of file